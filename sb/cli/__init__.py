@@ -1,9 +1,6 @@
 """Command line interface module."""
 
 from .cli_builder import Subcommand, CliWithSubcommands, Argument
-from ..workflows.build_stack import build_stack
-from ..workflows.update_repo import update_repos
-from ..utils.config import SIB_EASYCONFIGS_REPO, SIB_SOFTWARE_STACK_REPO
 
 
 class Cli(CliWithSubcommands):
@@ -12,7 +9,7 @@ class Cli(CliWithSubcommands):
     description = "SIB software stack builder"
     subcommands = (
         Subcommand(
-            f=build_stack,
+            f="sb.workflows.build_stack:build_stack",
             aliases=("build", "bs"),
             arguments=(
                 Argument(
@@ -51,7 +48,7 @@ class Cli(CliWithSubcommands):
             help_text="Build or update a local instance of the software stack.",
         ),
         Subcommand(
-            f=update_repos,
+            f="sb.workflows.update_repo:update_repos",
             aliases=("update", "ur"),
             arguments=(
                 Argument(
@@ -63,8 +60,11 @@ class Cli(CliWithSubcommands):
                     action="store_true",
                 ),
             ),
-            help_text=f"Update the '{SIB_EASYCONFIGS_REPO}' and "
-            f"'{SIB_SOFTWARE_STACK_REPO}' repositories.",
+            # Note: the repo names are given as literals (rather than using
+            # the constants from utils.config) so that the config module,
+            # and its Git dependencies, are not imported when building the CLI.
+            help_text="Update the 'sib-easyconfigs.git' and "
+            "'sib-software-stack.git' repositories.",
         ),
     )
 
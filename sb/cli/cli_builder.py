@@ -2,7 +2,8 @@
 
 import sys
 import argparse
-from typing import Any, Dict, Sequence, Optional, Callable
+import importlib
+from typing import Any, Dict, Sequence, Optional, Callable, Union
 
 
 class Argument:
@@ -20,7 +21,9 @@ class SubcommandBase:
 
     :param name: the name of the subcommand, as will be shown to the used in
         the CLI.
-    :param function: function associated to the subcommand.
+    :param function: function associated to the subcommand. The function can
+        also be given as a "module:function" string, in which case the module
+        is only imported when the subcommand is actually run.
     :param arguments: list of arguments that are accepted by the subcommand.
     :param help_text: text displayed when the user requests the help for the
         subcommand.
@@ -30,7 +33,7 @@ class SubcommandBase:
         self,
         name: str,
         aliases: Sequence[str],
-        function: Callable[..., Any],
+        function: Union[Callable[..., Any], str],
         arguments: Sequence[Argument],
         help_text: Optional[str] = None,
     ):
@@ -40,28 +43,61 @@ class SubcommandBase:
         self.function = function
         self.arguments = arguments
 
+    def resolve(self) -> Callable[..., Any]:
+        """Returns the function associated to the subcommand. If the function
+        was given as a "module:function" string, the module is imported upon
+        the first call to this method.
+        """
+        if not isinstance(self.function, str):
+            return self.function
+        module_name, _, function_name = self.function.partition(":")
+        function: Callable[..., Any] = getattr(
+            importlib.import_module(module_name), function_name
+        )
+        self.function = function
+        return function
+
 
 class Subcommand(SubcommandBase):
     """A single subcommand corresponding to a function f of the main workflow.
     The name of the subcommand and its help are derived from the function
     itself (unless overridden).
+
+    If f is passed as a "module:function" string, the function is only
+    imported when the subcommand is run. In this case, the help_text must be
+    given explicitly, as it cannot be derived without importing the function.
     """
 
     def __init__(
         self,
-        f: Callable[..., Any],
+        f: Union[Callable[..., Any], str],
         name: Optional[str] = None,
         aliases: Sequence[str] = (),
         arguments: Sequence[Argument] = (),
         help_text: Optional[str] = None,
     ):
+        if isinstance(f, str):
+            if ":" not in f:
+                raise ValueError(
+                    f"Invalid subcommand function reference '{f}': expected "
+                    "a value of the form 'module:function'."
+                )
+            if help_text is None:
+                raise ValueError(
+                    f"Subcommand '{f}': a help_text value must be provided "
+                    "when the function is given as a 'module:function' string."
+                )
+            f_name = f.partition(":")[2]
+        else:
+            f_name = f.__name__
+            help_text = f.__doc__ if help_text is None else help_text
 
         super().__init__(
-            name=f.__name__.replace("_", "-") if name is None else name,
+            name=f_name.replace("_", "-") if name is None else name,
             aliases=aliases,
             function=f,
             arguments=arguments,
-            help_text=f.__doc__ if help_text is None else help_text,
+            help_text=help_text,
         )
 
 
@@ -93,18 +129,31 @@ class CliWithSubcommands:
     description: Optional[str] = None
     required = True
     subcommands: Sequence[SubcommandBase] = ()
+    subcommands_by_name: Dict[str, SubcommandBase] = {}
     version: Optional[str] = None
 
+    def __init_subclass__(cls, **kwargs: Any):
+        """Build the dict object that associates each subcommand name and
+        alias to its subcommand. This is done once, when the class deriving
+        from CliWithSubcommands is defined.
+        """
+        super().__init_subclass__(**kwargs)
+        cls.subcommands_by_name = {}
+        for subcommand in cls.subcommands:
+            for name_or_alias in (subcommand.name, *subcommand.aliases):
+                if name_or_alias in cls.subcommands_by_name:
+                    raise ValueError(
+                        f"Duplicated subcommand name or alias: '{name_or_alias}'."
+                    )
+                cls.subcommands_by_name[name_or_alias] = subcommand
+
     def __init__(self, *args: Any, **kwargs: Any):
 
-        # Create the main parser object for the command line, as well as a
-        # dict object "actions" that will be used to store the function
-        # associated to each subcommand.
+        # Create the main parser object for the command line.
         parser = argparse.ArgumentParser(
             description=self.description,
             formatter_class=argparse.RawDescriptionHelpFormatter,
         )
-        self.functions_by_subcmd: Dict[str, Callable[..., Any]] = {}
 
         # Add the --version argument to the command line.
         if self.version is not None:
@@ -124,7 +173,17 @@ class CliWithSubcommands:
                     dest="subcommand", help="subcommand help"
                 )
 
-            for subcommand in self.subcommands:
+            # Only build the parser of the subcommand requested by the user,
+            # if it can be determined from the command line. Otherwise (e.g.
+            # the user asked for the top level help), all subcommand parsers
+            # are built.
+            argv = kwargs["args"] if "args" in kwargs else (args[0] if args else None)
+            requested_subcommand = self._sniff_subcommand(
+                sys.argv[1:] if argv is None else argv
+            )
+            for subcommand in (
+                (requested_subcommand,) if requested_subcommand else self.subcommands
+            ):
                 self.add_subcommand(subcommand)
 
         # Retrieve command line arguments passed by the user. user_input_args is
@@ -133,8 +192,9 @@ class CliWithSubcommands:
         user_input_args = vars(parser.parse_args(*args, **kwargs))
 
         # Run the function corresponding to the subcommand passed by the user.
-        function_to_run = self.functions_by_subcmd[user_input_args.pop("subcommand")]
-        function_to_run(**user_input_args)
+        # The function (and its module) is only loaded at this point.
+        subcommand = self.subcommands_by_name[user_input_args.pop("subcommand")]
+        subcommand.resolve()(**user_input_args)
 
     def add_subcommand(self, subcommand: SubcommandBase) -> None:
         """Add a subcommand to the main command line interface."""
@@ -146,15 +206,19 @@ class CliWithSubcommands:
             help=subcommand.help,
         )
 
-        # Add the function associated to the subcommand to the dictionary that
-        # associates functions with subcommand and alias names.
-        for name_or_alias in (subcommand.name, *subcommand.aliases):
-            if name_or_alias in self.functions_by_subcmd:
-                raise ValueError(
-                    f"Duplicated subcommand name or alias: '{name_or_alias}'."
-                )
-            self.functions_by_subcmd[name_or_alias] = subcommand.function
-
         # Add arguments from the subcommand to the subcommand parser.
         for arguments in subcommand.arguments:
             subcmd_parser.add_argument(*arguments.args, **arguments.kwargs)
+
+    def _sniff_subcommand(self, argv: Sequence[str]) -> Optional[SubcommandBase]:
+        """Returns the subcommand requested on the command line, i.e. the
+        subcommand matching the first non-option argument of argv. None is
+        returned if no subcommand is found or if the top level help was
+        requested.
+        """
+        for arg in argv:
+            if arg in ("-h", "--help"):
+                return None
+            if not arg.startswith("-"):
+                return self.subcommands_by_name.get(arg)
+        return None
@@ -1,14 +1,28 @@
 """Module for Config and package list file parsing."""
 
 import os
+import re
+import functools
 from enum import Enum
 from pathlib import Path
-from typing import Optional, Union, Sequence, List, Tuple, Iterator, Dict, Any
-
-from .git import GitRepo
+from typing import (
+    Optional,
+    Union,
+    Sequence,
+    List,
+    Set,
+    Tuple,
+    Iterator,
+    Dict,
+    Any,
+    FrozenSet,
+)
+
+from .git import GitRepo, open_repo
 
 EB_CONFIG_FILE = "config.cfg"
 SB_CONFIG_FILE = "config_stackbuilder.cfg"
+HOME_DIR = os.path.expanduser("~").rstrip(os.path.sep)
 EB_DEFAULT_CONFIG_DIR = Path.home().joinpath(".config", "easybuild").as_posix()
 SIB_EASYCONFIGS_REPO = "sib-easyconfigs.git"
 SIB_SOFTWARE_STACK_REPO = "sib-software-stack.git"
@@ -20,13 +34,27 @@ LICENSE_FILES_DIR = Path.home().joinpath("licenses").as_posix()
 EB_OFFICIAL_REPO = "https://github.com/easybuilders/easybuild-easyconfigs"
 EB_OFFICIAL_REPO_NAME = "eb-source"
 
+# Regular expression matching "argument = value" lines of config files. Any
+# trailing comment is excluded from the value.
+CONFIG_LINE_REGEX = re.compile(r"^\s*([\w-]+)\s*=\s*([^#\s][^#]*?)\s*(?:#.*)?$")
+
+# Regular expression matching the separators of list values in config files,
+# along with any surrounding whitespace and double quotes (list values can be
+# given as e.g. "vitalit","scicore").
+LIST_SEPARATOR_REGEX = re.compile(r'\s*"?\s*[:;,]\s*"?\s*')
+
+# Cache of config file values: config file path -> (file mtime, values).
+CONFIG_FILE_CACHE: Dict[str, Tuple[float, Dict[str, str]]] = {}
+
 # List of easyconfigs for which a "-noAVX2.eb"
-NO_AVX2_PACKAGES = [
-    "FFTW-3.3.9-gompi-2021a.eb",
-    "RDKit-2021.03.4-foss-2021a.eb",
-    "RDKit-2022.03.3-foss-2021a.eb",
-    "OpenBabel-3.1.1-gompi-2021a.eb",
-]
+NO_AVX2_PACKAGES: FrozenSet[str] = frozenset(
+    (
+        "FFTW-3.3.9-gompi-2021a.eb",
+        "RDKit-2021.03.4-foss-2021a.eb",
+        "RDKit-2022.03.3-foss-2021a.eb",
+        "OpenBabel-3.1.1-gompi-2021a.eb",
+    )
+)
 
 
 class UserAnswer(Enum):
@@ -63,6 +91,30 @@ SIB_NODE_SYNONYMS: Dict[SIBNode, Tuple[str, ...]] = {
     SIBNode.TEST: (SIBNode.TEST.value, "TEST"),
 }
 
+# Reverse lookup tables: synonym -> UserAnswer/SIBNode.
+USER_ANSWER_BY_SYNONYM: Dict[str, UserAnswer] = {
+    synonym: user_answer
+    for user_answer, synonyms in USER_ANSWER_SYNONYMS.items()
+    for synonym in synonyms
+}
+SIB_NODE_BY_SYNONYM: Dict[str, SIBNode] = {
+    synonym: node
+    for node, synonyms in SIB_NODE_SYNONYMS.items()
+    for synonym in synonyms
+}
+
+
+def _expanduser(path: str) -> str:
+    """Equivalent of os.path.expanduser, with a fast path for the common cases
+    where the path does not start with "~", or starts with the home directory
+    of the current user ("~/").
+    """
+    if not path.startswith("~"):
+        return path
+    if path == "~" or path.startswith("~/"):
+        return (HOME_DIR + path[1:]) or os.path.sep
+    return os.path.expanduser(path)
+
 
 class StackBuilderConfig:
     """Class holding the information from the EasyBuild configuration file as
@@ -78,33 +130,50 @@ class StackBuilderConfig:
         robot_paths: Sequence[str],
         sib_node: SIBNode,
         other_nodes: Optional[Sequence[SIBNode]] = None,
-        sib_easyconfigs_repo: Optional[str] = None,
-        sib_software_stack_repo: Optional[str] = None,
+        sib_easyconfigs_repo: Union[str, GitRepo, None] = None,
+        sib_software_stack_repo: Union[str, GitRepo, None] = None,
         optional_software: Optional[Sequence[SIBNode]] = None,
         optarch: Optional[str] = None,
         job_cores: Union[int, str] = 0,
         allow_reset_node_branch: UserAnswer = UserAnswer.INTERACTIVE,
         allow_reset_other_nodes_branch: UserAnswer = UserAnswer.INTERACTIVE,
+        skip_validation: bool = False,
     ) -> None:
 
         # Required EasyBuild properties.
-        self.buildpath = os.path.expanduser(buildpath)
-        self.sourcepath = os.path.expanduser(sourcepath)
-        self.installpath = os.path.expanduser(installpath)
-        self.robot_paths = [os.path.expanduser(x) for x in robot_paths]
+        self.buildpath = _expanduser(buildpath)
+        self.sourcepath = _expanduser(sourcepath)
+        self.installpath = _expanduser(installpath)
+        self.robot_paths = [_expanduser(x) for x in robot_paths]
 
         # Required stack-builder properties.
         self.sib_node = sib_node
-        self.sib_easyconfigs_repo = GitRepo(
-            path=sib_easyconfigs_repo or self._dir_from_robotpath(SIB_EASYCONFIGS_REPO),
-            main_branch_name=SIB_EASYCONFIGS_MAIN_BRANCH,
-            main_remote_name="origin",
+        self._node_synonyms = SIB_NODE_SYNONYMS[self.sib_node]
+        self._other_node_branch_names = tuple(
+            x.value for x in SIBNode if x is not self.sib_node
         )
-        self.sib_software_stack_repo = GitRepo(
-            path=sib_software_stack_repo
-            or self._dir_from_robotpath(SIB_SOFTWARE_STACK_REPO),
-            main_branch_name=SIB_SOFT_STACK_MAIN_BRANCH,
-            main_remote_name="origin",
+
+        # The Git repos can be passed either as paths or as already opened
+        # GitRepo objects (e.g. repos opened in static mode by load_config).
+        self.sib_easyconfigs_repo = (
+            sib_easyconfigs_repo
+            if isinstance(sib_easyconfigs_repo, GitRepo)
+            else open_repo(
+                path=sib_easyconfigs_repo
+                or self._dir_from_robotpath(SIB_EASYCONFIGS_REPO),
+                main_branch_name=SIB_EASYCONFIGS_MAIN_BRANCH,
+                main_remote_name="origin",
+            )
+        )
+        self.sib_software_stack_repo = (
+            sib_software_stack_repo
+            if isinstance(sib_software_stack_repo, GitRepo)
+            else open_repo(
+                path=sib_software_stack_repo
+                or self._dir_from_robotpath(SIB_SOFTWARE_STACK_REPO),
+                main_branch_name=SIB_SOFT_STACK_MAIN_BRANCH,
+                main_remote_name="origin",
+            )
         )
         self.allow_reset_node_branch = allow_reset_node_branch
         self.allow_reset_other_nodes_branch = allow_reset_other_nodes_branch
@@ -116,8 +185,8 @@ class StackBuilderConfig:
         # Optional stack-builder properties.
         self.other_nodes = tuple(
             x
-            for x in (other_nodes if other_nodes else tuple(SIBNode))
-            if x != self.sib_node
+            for x in (other_nodes if other_nodes else SIBNode)
+            if x is not self.sib_node
         )
 
         self.optional_software = (self.sib_node,) + tuple(
@@ -126,16 +195,15 @@ class StackBuilderConfig:
             if x != self.sib_node
         )
 
-        self.__post_init__()
-
-    # TODO: __post_init__ not called when class is instantiated.
-    def __post_init__(self):
-        self.validate()
+        # Validation of the config values can be skipped if they were already
+        # verified by the caller (e.g. in load_config).
+        if not skip_validation:
+            self.validate()
 
     @property
     def node_synonyms(self) -> Tuple[str, ...]:
         """Returns list of synonym names for the local node."""
-        return SIB_NODE_SYNONYMS[self.sib_node]
+        return self._node_synonyms
 
     @property
     def node_branch_name(self) -> str:
@@ -145,9 +213,7 @@ class StackBuilderConfig:
     @property
     def other_node_branch_names(self) -> Tuple[str, ...]:
         """Returns Git branch names of the other SIB nodes."""
-        return tuple(
-            x.value for x in tuple(SIBNode) if x.value != self.node_branch_name
-        )
+        return self._other_node_branch_names
 
     @property
     def package_list_file(self) -> str:
@@ -191,32 +257,41 @@ class StackBuilderConfig:
         paths present in robot_paths.
         """
         dir_name = dir_name.replace(".git", "")
-        try:
-            # Test if directory is among the robot-path directories.
-            (repo_path,) = [x for x in self.robot_paths if dir_name in x]
 
-            # Remove any trailing sub-directory from the path.
-            while not os.path.basename(repo_path).startswith(dir_name):
-                repo_path = os.path.dirname(repo_path)
-                if repo_path == os.path.sep:
-                    raise ValueError()
+        # Test if directory is among the robot-path directories. The search
+        # stops as soon as a second matching path is found, as the repo
+        # location is then ambiguous.
+        matching_path = None
+        for path in self.robot_paths:
+            if dir_name in path:
+                if matching_path is not None:
+                    raise ValueError(
+                        f"Path to '{dir_name}' repo is ambiguous: more than one "
+                        "path of robot-paths in the EasyBuild config file "
+                        f"matches: [{matching_path}] and [{path}]."
+                    )
+                matching_path = path
+
+        if matching_path is not None:
+            # Remove any trailing sub-directory from the path, i.e. keep the
+            # path up to its last component that starts with dir_name.
+            path_parts = Path(matching_path).parts
+            for index in reversed(range(len(path_parts))):
+                if path_parts[index].startswith(dir_name):
+                    return Path(*path_parts[: index + 1]).as_posix()
 
-        except ValueError:
-            raise ValueError(
-                f"Path to '{dir_name}' repo not found in the EasyBuild "
-                "config file. The path should be part of robot-paths."
-            ) from None
-
-        return repo_path
+        raise ValueError(
+            f"Path to '{dir_name}' repo not found in the EasyBuild "
+            "config file. The path should be part of robot-paths."
+        )
 
 
 def str_to_node(node_name: str) -> SIBNode:
     """Returns the SIBNode object corresponding to the given node name or one
     if its synonyms.
     """
-    for node, synonyms in SIB_NODE_SYNONYMS.items():
-        if node_name in synonyms:
-            return node
+    if node_name in SIB_NODE_BY_SYNONYM:
+        return SIB_NODE_BY_SYNONYM[node_name]
 
     raise ValueError(
         f"Unable to determine the node value: the node name '{node_name}' "
@@ -235,9 +310,8 @@ def str_to_node(node_name: str) -> SIBNode:
 def str_to_user_answer(value: str) -> UserAnswer:
     """Converts a string value into the corresponding UserAnswer Enum value."""
 
-    for user_answer, synonyms in USER_ANSWER_SYNONYMS.items():
-        if value.lower() in synonyms:
-            return user_answer
+    if value.lower() in USER_ANSWER_BY_SYNONYM:
+        return USER_ANSWER_BY_SYNONYM[value.lower()]
 
     raise ValueError(
         f"The value '{value}' does not match any accepted 'user answer' or "
@@ -254,13 +328,35 @@ def str_to_user_answer(value: str) -> UserAnswer:
 
 def str_to_list(value: str) -> List[str]:
     """Converts a string to a list of strings by splitting it using a number
-    of pre-defined separators.
+    of pre-defined separators (":", ";" or ",").
     """
-    value = value.strip()
-    for sep in (":", ";", ","):
-        if sep in value:
-            return [x.strip() for x in value.split(sep)]
-    return [value]
+    return LIST_SEPARATOR_REGEX.split(value.strip())
+
+
+def _read_config_file(config_file_path: str) -> Dict[str, str]:
+    """Read the specified config file and return all its "argument = value"
+    pairs as a dictionary. Comment lines are ignored.
+
+    Results are cached, so that each config file is only read again if it was
+    modified since it was last read.
+    """
+    config_file_path = _expanduser(config_file_path)
+    mtime = os.path.getmtime(config_file_path)
+    if config_file_path in CONFIG_FILE_CACHE:
+        cached_mtime, cached_values = CONFIG_FILE_CACHE[config_file_path]
+        if cached_mtime == mtime:
+            return cached_values
+
+    raw_values: Dict[str, str] = {}
+    config_file_content = Path(config_file_path).read_text(encoding="utf8")
+    for line in config_file_content.splitlines():
+        match = CONFIG_LINE_REGEX.match(line)
+        if match:
+            argument, value = match.groups()
+            raw_values[argument.replace("-", "_")] = value.strip('"')
+
+    CONFIG_FILE_CACHE[config_file_path] = (mtime, raw_values)
+    return raw_values
 
 
 def config_values_from_file(
@@ -273,25 +369,20 @@ def config_values_from_file(
     args_captured: Dict[str, Any] = {}
     sequence_args = ("robot_paths", "other_nodes", "optional_software")
 
-    # Read through the config file, load required and optional arguments, and
-    # ignore comment lines.
-    with open(os.path.expanduser(config_file_path), mode="r", encoding="utf8") as f:
-        for line in f:
-            line = line.strip()
-            if line.startswith("#") or " = " not in line:
-                continue
-
-            argument, value = map(str.strip, line.split(" = "))
-            argument = argument.replace("-", "_")
-            value = value.replace('"', "")
-            if argument in args_required or argument in args_optional:
-                if argument in sequence_args:
-                    args_captured[argument] = str_to_list(value)
-                else:
-                    args_captured[argument] = value
+    # Load required and optional arguments from the config file. Only the
+    # requested arguments are looked-up in the (cached) config file values,
+    # instead of testing each value of the file against the requested ones.
+    config_file_values = _read_config_file(config_file_path)
+    for argument in (*args_required, *args_optional):
+        if argument in config_file_values:
+            value = config_file_values[argument]
+            if argument in sequence_args:
+                args_captured[argument] = str_to_list(value)
+            else:
+                args_captured[argument] = value
 
     # If a required value is missing, raise an error.
-    missing_args = set(args_required) - set(args_captured.keys())
+    missing_args = [x for x in args_required if x not in args_captured]
     if missing_args:
         raise ValueError(
             "One or more required values are missing from the config file "
@@ -301,9 +392,13 @@ def config_values_from_file(
     return args_captured
 
 
-def load_config() -> StackBuilderConfig:
+def load_config(static_repos: bool = False) -> StackBuilderConfig:
     """Load an EasyBuild configuration file from disk and return the values
     as a StackBuilderConfig object.
+
+    :param static_repos: if True, the Git repos of the config are opened in
+        "static" mode, where their branches are only listed once and cannot
+        be modified. See GitRepo.
     """
 
     # Load values from the EasyBuild config file.
@@ -355,34 +450,63 @@ def load_config() -> StackBuilderConfig:
         for x in ("sib_easyconfigs_repo", "sib_software_stack_repo")
     )
 
+    # Each distinct path is only checked once, even if it is given for more
+    # than one argument.
     robot_paths = []
+    is_dir_by_path: Dict[str, bool] = {}
+    missing_dirs = []
     for path, arg_name, config_file in paths_to_check:
         # Update path argument with expanded user home directory.
-        path = os.path.expanduser(path)
+        path = _expanduser(path)
         if arg_name == "robot_paths":
             robot_paths.append(path)
         else:
             args_captured[arg_name] = path
 
-        if not os.path.isdir(path):
-            raise ValueError(
-                f"Config file error [{config_file}]: unable to find directory"
-                f"specified for argument '{arg_name}' [{path}]."
+        if path not in is_dir_by_path:
+            is_dir_by_path[path] = os.path.isdir(path)
+        if not is_dir_by_path[path]:
+            missing_dirs.append(
+                f"argument '{arg_name}' [{path}] in config file [{config_file}]"
             )
 
+    if missing_dirs:
+        raise ValueError(
+            "Config file error: unable to find the directory specified for "
+            "one or more arguments:\n -> " + "\n -> ".join(missing_dirs)
+        )
+
     # Update path values with expanded user home directory for robot-path.
+    # Since all paths were verified above, they are not verified a second time
+    # when instantiating the StackBuilderConfig object.
     args_captured["robot_paths"] = robot_paths
-    return StackBuilderConfig(**args_captured)
+
+    # Open the Git repos, in static mode if requested.
+    for arg_name, main_branch_name in (
+        ("sib_easyconfigs_repo", SIB_EASYCONFIGS_MAIN_BRANCH),
+        ("sib_software_stack_repo", SIB_SOFT_STACK_MAIN_BRANCH),
+    ):
+        args_captured[arg_name] = open_repo(
+            path=args_captured[arg_name],
+            main_branch_name=main_branch_name,
+            main_remote_name="origin",
+            static=static_repos,
+        )
+    return StackBuilderConfig(**args_captured, skip_validation=True)
 
 
+@functools.lru_cache(maxsize=None)
 def config_file_from_environment_variable(environment_var_name: str) -> Optional[str]:
     """Test whether the specified shell environment variable exists and:
     * If True, check whether it points to an existing file, and if so,
       return that file. Raise an error otherwise.
     * If False, returns None.
+
+    Results are cached, as environment variables are not expected to change
+    during the lifetime of the application.
     """
     if environment_var_name in os.environ:
-        config_file = Path(os.path.expanduser(os.environ[environment_var_name]))
+        config_file = Path(_expanduser(os.environ[environment_var_name]))
         if config_file.is_file():
             return config_file.as_posix()
 
@@ -395,12 +519,16 @@ def config_file_from_environment_variable(environment_var_name: str) -> Optional
     return None
 
 
+@functools.lru_cache(maxsize=1)
 def get_eb_config_file() -> str:
     """Search for an EasyBuild config file in different locations and return
     the path to the file if found.
     The following locations are searched:
      * EASYBUILD_CONFIGFILES environment variable.
      * ~/.config/easybuild (the default easybuild location for config files).
+
+    The search is only performed once per process: subsequent calls return
+    the cached result.
     """
 
     # Try to retrieve the config file form the EASYBUILD_CONFIGFILES
@@ -423,6 +551,7 @@ def get_eb_config_file() -> str:
     )
 
 
+@functools.lru_cache(maxsize=1)
 def get_sb_config_file() -> str:
     """Search for a stack-builder config file in different locations and return
     the path of the config file if found.
@@ -431,6 +560,9 @@ def get_sb_config_file() -> str:
      * STACKBUILDER_CONFIGFILES environment variable.
      * EASYBUILD_CONFIGFILES environment variable.
      * ~/.config/easybuild (the default easybuild location for config files).
+
+    The search is only performed once per process: subsequent calls return
+    the cached result.
     """
     # Try to retrieve the config file form the STACKBUILDER_CONFIGFILES
     # environment variable.
@@ -448,7 +580,7 @@ def get_sb_config_file() -> str:
         for x in ([os.path.dirname(env_var_path)] if env_var_path else [])
         + [EB_DEFAULT_CONFIG_DIR]
     ]
-    for config_file in (os.path.expanduser(x) for x in config_files):
+    for config_file in (_expanduser(x) for x in config_files):
         if os.path.isfile(config_file):
             return config_file
 
@@ -472,59 +604,66 @@ def load_package_list(
     The local node information is provided in the sb_config object.
     """
 
-    # Get list of already installed module files. This will be needed later to
-    # determine whether a packages has already been built or not.
-    already_installed_modules = list(get_installed_module_files(sb_config.installpath))
+    # Get the set of already installed module files. This will be needed later
+    # to determine whether a packages has already been built or not.
+    already_installed_modules = set(get_installed_module_files(sb_config.installpath))
+
+    # Synonyms of the local node, as a set, since they are tested for each
+    # node-specific line of the package list.
+    node_synonyms = frozenset(sb_config.node_synonyms)
 
     # Read the file containing the list of packages to build, skipping comments
     # and empty lines.
     packages_to_build: List[str] = []
     packages_already_built: List[str] = []
+    package_basenames: Set[str] = set()
     with open(sb_config.package_list_file, mode="r", encoding="utf8") as f:
+        package_list = f.read().splitlines()
 
-        for line in (x for x in map(strip_comment, f) if x):
+    for line in (x for x in map(strip_comment, package_list) if x):
 
-            # Skip packages that should not be built on the current node.
-            split_line = line.split()
-            if len(split_line) > 1:
-                nodes, line = split_line
-                if not any(x in nodes.split(",") for x in sb_config.node_synonyms):
-                    continue
+        # Skip packages that should not be built on the current node.
+        split_line = line.split()
+        if len(split_line) > 1:
+            nodes, line = split_line
+            if node_synonyms.isdisjoint(nodes.split(",")):
+                continue
 
-            # Add ".eb" extension to the package name if needed, and generate
-            # name of module corresponding to the package. The reason the
-            # "basename" of the package is taken is because it can happen that
-            # the value of pkg_name is an entire path to an easyconfig, and not
-            # just the name of the file.
-            pkg_name = verify_and_add_extension(line)
-            module_name = f"{os.path.basename(pkg_name)[:-3]}.lua"
-
-            # If requested, replace packages for which an easyconfig without
-            # avx2 support exists.
-            if no_avx2 and pkg_name in NO_AVX2_PACKAGES:
-                pkg_name = pkg_name[:-3] + "-noAVX2.eb"
-
-            # Verify there is no duplicated package name.
-            if os.path.basename(pkg_name) in (
-                os.path.basename(x) for x in packages_already_built + packages_to_build
-            ):
-                raise ValueError(
-                    f"Error while loading package list file. Duplicated "
-                    f"package [{pkg_name}] in file [{sb_config.package_list_file}]"
-                )
-
-            # Place package in the correct "built"/"to build" list.
-            if module_name in already_installed_modules:
-                packages_already_built.append(pkg_name)
-            else:
-                packages_to_build.append(pkg_name)
+        # Add ".eb" extension to the package name if needed, and generate
+        # name of module corresponding to the package. The reason the
+        # "basename" of the package is taken is because it can happen that
+        # the value of pkg_name is an entire path to an easyconfig, and not
+        # just the name of the file.
+        pkg_name = verify_and_add_extension(line)
+        pkg_basename = os.path.basename(pkg_name)
+        module_name = pkg_basename[:-3] + ".lua"
+
+        # If requested, replace packages for which an easyconfig without
+        # avx2 support exists.
+        if no_avx2 and pkg_name in NO_AVX2_PACKAGES:
+            pkg_name = pkg_name[:-3] + "-noAVX2.eb"
+            pkg_basename = pkg_basename[:-3] + "-noAVX2.eb"
+
+        # Verify there is no duplicated package name.
+        if pkg_basename in package_basenames:
+            raise ValueError(
+                f"Error while loading package list file. Duplicated "
+                f"package [{pkg_name}] in file [{sb_config.package_list_file}]"
+            )
+        package_basenames.add(pkg_basename)
+
+        # Place package in the correct "built"/"to build" list.
+        if module_name in already_installed_modules:
+            packages_already_built.append(pkg_name)
+        else:
+            packages_to_build.append(pkg_name)
 
     return (packages_already_built, packages_to_build)
 
 
 def strip_comment(s: str, sep: str = "#") -> str:
     """Strips comments - any characters placed after a # - from strings."""
-    return s[: s.find(sep)].strip() if sep in s else s.strip()
+    return s.partition(sep)[0].strip()
 
 
 def verify_and_add_extension(package_name: str, extension: str = ".eb") -> str:
@@ -545,6 +684,16 @@ def get_installed_module_files(installpath: str) -> Iterator[str]:
 
     Example: ['GCCcore-10.3.0.lua', 'binutils-2.36.1.lua'].
     """
-    for root, _, files in os.walk(os.path.join(installpath, "modules", "all")):
-        for f in files:
-            yield os.path.basename(root) + "-" + f
+    # The EasyBuild module tree has a fixed two-level layout:
+    # "modules/all/<package name>/<version>.lua".
+    try:
+        with os.scandir(os.path.join(installpath, "modules", "all")) as pkg_dirs:
+            for pkg_dir in pkg_dirs:
+                if not pkg_dir.is_dir(follow_symlinks=False):
+                    continue
+                with os.scandir(pkg_dir.path) as files:
+                    for f in files:
+                        if f.is_file():
+                            yield f"{pkg_dir.name}-{f.name}"
+    except FileNotFoundError:
+        pass
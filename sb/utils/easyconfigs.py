@@ -7,7 +7,7 @@ from dataclasses import dataclass
 from typing import Generator, Iterable, Sequence, Dict, Tuple, Optional, List
 from .config import StackBuilderConfig, LICENSE_FILES_DIR
 from .utils import get_files_from_directory, create_directory
-from .git import GitRepo, Status, switch_to_branch_if_repo
+from .git import GitRepo, Status, active_branch_name
 
 
 @dataclass
@@ -126,6 +126,28 @@ def find_easyconfigs(
     return easyconfigs_by_name
 
 
+def _tracked_files(
+    git_repo: GitRepo, refspec: str, path: Optional[str] = None
+) -> Tuple[str, ...]:
+    """Returns the full path of all files tracked in the Git repo at the
+    specified reference (e.g. a branch or a commit), without checking-out
+    that reference.
+
+    :param git_repo: Git repo object of the Git repo to search.
+    :param refspec: branch, remote branch or commit to list files from.
+    :param path: optional. If specified, only files located in this
+        directory (or its sub-directories) are returned.
+    """
+    args = ["-r", "-z", "--name-only", refspec]
+    if path:
+        args.extend(("--", os.path.relpath(path, git_repo.path)))
+    return tuple(
+        os.path.join(git_repo.path, f)
+        for f in git_repo.git.ls_tree(*args).split("\0")
+        if f
+    )
+
+
 def get_easyconfigs_from_directory(
     easyconfig_names: Iterable[str],
     dir_path: str,
@@ -138,7 +160,10 @@ def get_easyconfigs_from_directory(
 
     If the directory to search is under Git version control, a specific branch
     of the repository can be searched by passing the git repo and branch name
-    to search to the function.
+    to search to the function. Note that if the branch to search is the
+    currently checked-out branch, the directory is searched on disk, so that
+    untracked and locally modified files are also found. Other branches are
+    searched using the files committed on that branch ("git ls-tree").
 
     Easyconfigs that are not found are absent from the returned dictionary.
 
@@ -151,30 +176,43 @@ def get_easyconfigs_from_directory(
     :param git_branch: optional. branch of the Git repo to search.
     """
 
-    # If the directory is a git repo, switch to the specified branch before
-    # searching through the target directory.
-    with switch_to_branch_if_repo(git_repo, git_branch):
-
+    if git_repo and git_branch and git_branch != active_branch_name(git_repo):
+        # If the branch to search is not the currently checked-out branch, its
+        # files are listed directly from the Git repo, so that the branch
+        # does not have to be checked-out.
+        files_in_dir = tuple(
+            f
+            for f in _tracked_files(git_repo, git_branch, dir_path)
+            if f.endswith(".eb")
+        )
+    else:
         # Retrieve all easyconfig files located in the target directory.
         files_in_dir = tuple(
             get_files_from_directory(dir_path, extension=".eb", full_path=True)
         )
 
-        # Loop through all easyconfigs to recover from the directory, and check
-        # whether they can be found in the target directory.
-        easyconfigs_by_name: Dict[str, Easyconfig] = {}
-        for easyconfig_name in easyconfig_names:
-            for f in files_in_dir:
-                if f.endswith(os.path.sep + easyconfig_name):
-                    easyconfigs_by_name[easyconfig_name] = Easyconfig(
-                        name=os.path.basename(easyconfig_name),
-                        path=os.path.dirname(f),
-                        repo=git_repo,
-                        branch=git_branch,
-                    )
-                    break
-
-        return easyconfigs_by_name
+    # Index the files found in the directory by their basename. Since
+    # easyconfig names may include (part of) their path, several files can
+    # share the same basename, and the first file whose path matches is kept.
+    files_by_basename: Dict[str, List[str]] = {}
+    for f in files_in_dir:
+        files_by_basename.setdefault(os.path.basename(f), []).append(f)
+
+    # Loop through all easyconfigs to recover from the directory, and check
+    # whether they can be found in the target directory.
+    easyconfigs_by_name: Dict[str, Easyconfig] = {}
+    for easyconfig_name in easyconfig_names:
+        for f in files_by_basename.get(os.path.basename(easyconfig_name), ()):
+            if f.endswith(os.path.sep + easyconfig_name):
+                easyconfigs_by_name[easyconfig_name] = Easyconfig(
+                    name=os.path.basename(easyconfig_name),
+                    path=os.path.dirname(f),
+                    repo=git_repo,
+                    branch=git_branch,
+                )
+                break
+
+    return easyconfigs_by_name
 
 
 def install_license_files(sb_config: StackBuilderConfig) -> None:
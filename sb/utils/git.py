@@ -1,16 +1,18 @@
 """Module for Git related functions."""
 
 import os
-import sys
+import time
+import functools
 import contextlib
 from contextlib import contextmanager
 from typing import (
     ContextManager,
-    Iterable,
     Tuple,
     Generator,
     Any,
     Optional,
+    Sequence,
+    Dict,
     cast,
 )
 from enum import Enum
@@ -18,6 +20,14 @@ from enum import Enum
 import git
 from git import refs
 
+# Time, in seconds, during which updates fetched from a remote are considered
+# recent enough that they do not need to be fetched again.
+FETCH_TTL = 5.0
+
+# Context manager that does nothing. It holds no state and can therefore be
+# re-used, instead of instantiating a new one each time it is needed.
+NULL_CONTEXT: ContextManager[None] = contextlib.nullcontext()
+
 
 class Status(Enum):
     """Status of a git branch as compared to its upstream branch."""
@@ -33,10 +43,15 @@ class GitRepoError(Exception):
     """Error class for GitRepo"""
 
     def __init__(self, msg: Optional[str] = None, repo: Optional["GitRepo"] = None):
-        super().__init__(
-            (f"Error in Git repository [{repo.path}]. " if repo else "")
-            + (msg if msg else "Unspecified error message.")
-        )
+        super().__init__(msg)
+        self.msg = msg
+        self.repo = repo
+
+    def __str__(self) -> str:
+        # The error message is only built when the error is displayed.
+        return (
+            f"Error in Git repository [{self.repo.path}]. " if self.repo else ""
+        ) + (self.msg if self.msg else "Unspecified error message.")
 
 
 class GitRepo(git.Repo):
@@ -48,8 +63,28 @@ class GitRepo(git.Repo):
         *args: Any,
         main_branch_name: str = "main",
         main_remote_name: str = "origin",
+        static: bool = False,
         **kwargs: Any,
     ):
+        # In "static" mode, the branches of the repo are assumed to not change
+        # for the lifetime of the object: they are listed only once, and
+        # operations that create or update branches raise an error.
+        self.static = static
+
+        # Cache of the repo's local and remote branches, indexed by name. See
+        # `_branch_index()`.
+        self._branch_index_cache: Optional[
+            Tuple[Dict[str, refs.head.Head], Dict[str, git.RemoteReference]]
+        ] = None
+
+        # Time of the last fetch made from each remote of the repo, and
+        # whether that fetch pruned deleted remote branches. See `_fetch()`.
+        self._last_fetch: Dict[str, Tuple[float, bool]] = {}
+
+        # Cache of the status of commits relative to each other, keyed by the
+        # hash of the two compared commits. See `branch_status()`.
+        self._branch_status_cache: Dict[Tuple[str, str], Status] = {}
+
         # Instantiate a new git.Repo object.
         try:
             super().__init__(os.path.expanduser(path), *args, **kwargs)
@@ -87,9 +122,7 @@ class GitRepo(git.Repo):
     @property
     def branch_names(self) -> Tuple[str, ...]:
         """Returns the names of all local branches of the git repo."""
-        return tuple(
-            branch.name for branch in cast(Iterable[refs.head.Head], self.branches)
-        )
+        return tuple(self._branch_index()[0])
 
     @property
     def remote_names(self) -> Tuple[str, ...]:
@@ -99,18 +132,54 @@ class GitRepo(git.Repo):
     @property
     def remote_branch_names(self) -> Tuple[str, ...]:
         """Returns the names of all remote branches of the git repo."""
-        return tuple(x.name for remote in self.remotes for x in remote.refs)
+        return tuple(self._branch_index()[1])
+
+    def _branch_index(
+        self,
+    ) -> Tuple[Dict[str, refs.head.Head], Dict[str, git.RemoteReference]]:
+        """Returns the local and remote branches of the repo, each indexed by
+        their name. The index is cached, and must be invalidated by all
+        methods that create or delete branches or remote branches. Methods
+        that only move existing branches do not need to invalidate it, since
+        the commit of a branch object is looked-up each time it is accessed.
+        Branches created or deleted by external git commands are therefore
+        not seen until the index is invalidated.
+        """
+        if self._branch_index_cache is None:
+            branches = {branch.name: branch for branch in self.heads}
+            remote_branches = {
+                x.name: x for remote in self.remotes for x in remote.refs
+            }
+            self._branch_index_cache = (branches, remote_branches)
+        return self._branch_index_cache
+
+    def _invalidate_branch_index(self) -> None:
+        """Clears the cache of local and remote branches. In static repos,
+        branches are not expected to change, so the cache is never cleared.
+        """
+        if not self.static:
+            self._branch_index_cache = None
+
+    def _verify_not_static(self, operation: str) -> None:
+        """Raises an error if the repo was opened in static mode, in which
+        operations that create or update branches are not allowed.
+        """
+        if self.static:
+            raise GitRepoError(
+                f"Cannot {operation}: repo was opened in static (read-only) mode.",
+                repo=self,
+            )
 
     def branch(self, name: Optional[str] = None) -> refs.head.Head:
         """Returns the branch object corresponding to the specified name.
         If no branch name is passed as argument, the default branch of the
         repository is returned.
         """
-        branch: refs.head.Head
-        for branch in cast(Iterable[refs.head.Head], self.branches):
-            if branch.name == (name or self.main_branch_name):
-                return branch
-        raise GitRepoError(f"Repo has no branch '{name}'.", repo=self)
+        target = name or self.main_branch_name
+        try:
+            return self._branch_index()[0][target]
+        except KeyError:
+            raise GitRepoError(f"Repo has no branch '{target}'.", repo=self) from None
 
     def remote_branch(
         self, name: str, remote: Optional[git.Remote] = None
@@ -129,12 +198,12 @@ class GitRepo(git.Repo):
         if "/" not in name:
             name = f"{remote.name if remote else self.default_remote.name}/{name}"
 
-        for repo_remote in self.remotes:
-            for remote_branch in repo_remote.refs:
-                if remote_branch.name == name:
-                    return remote_branch
-
-        raise GitRepoError(f"Repo has no remote branch '{name}'.", repo=self)
+        try:
+            return self._branch_index()[1][name]
+        except KeyError:
+            raise GitRepoError(
+                f"Repo has no remote branch '{name}'.", repo=self
+            ) from None
 
     def branch_status(
         self, branch_name: str, branch_to_compare_with: Optional[str] = None
@@ -145,55 +214,140 @@ class GitRepo(git.Repo):
         # If no branch to compare to is provided, use the upstream of the
         # specified branch.
         if not branch_to_compare_with:
-            branch = self.branch(branch_name)
-            remote_branch = branch.tracking_branch()
-            if not remote_branch:
-                return Status.NO_UPSTREAM
-            branch_to_compare_with = remote_branch.name
+            return self._upstream_status(branch_name)[0]
 
         # Verify the branches to compare exist in the repo.
+        branches, remote_branches = self._branch_index()
         for b in (branch_name, branch_to_compare_with):
-            if b not in self.branch_names + self.remote_branch_names:
+            if b not in branches and b not in remote_branches:
                 raise GitRepoError(
                     f"Repo has no branch '{b}'. Cannot perform branch status "
                     f"comparison: {branch_name}...{branch_to_compare_with}",
                     repo=self,
                 )
 
-        # Use the "git rev-list --left-right --count branch...origin/branch"
-        # command to determine whether the specified branch is ahead or behind
-        # its remote counterpart. If it is both ahead and behind, it means that
-        # the branches have diverged.
-        ahead, behind = (
-            int(x)
-            for x in self.git.rev_list(
-                "--left-right", "--count", f"{branch_name}...{branch_to_compare_with}"
-            ).split()
+        # Branch references are resolved in-process by GitPython, which avoids
+        # spawning a git subprocess when both branches are up-to-date.
+        return self._commit_status(
+            self.commit(branch_name).hexsha, self.commit(branch_to_compare_with).hexsha
         )
-        if ahead == 0 and behind == 0:
+
+    def _commit_status(self, commit: str, commit_to_compare_with: str) -> Status:
+        """Determines whether the specified commit is identical, ahead or
+        behind the commit to compare with, or whether their history has
+        diverged. Both commits must be given as full hexsha values.
+        """
+        # If both branches point to the same commit, they are up-to-date.
+        commits = (commit, commit_to_compare_with)
+        if commits[0] == commits[1]:
             return Status.UP_TO_DATE
-        if behind == 0:
-            return Status.AHEAD
-        if ahead == 0:
-            return Status.BEHIND
-        return Status.DIVERGED
-
-    def fetch_updates(self) -> None:
-        """Fetch updates from all remotes associated to the repo."""
-        for remote in self.remotes:
-            remote.fetch(prune=True)
+
+        # The status of two commits relative to each other never changes, so
+        # it is only computed once for each pair of commits.
+        if commits in self._branch_status_cache:
+            return self._branch_status_cache[commits]
+
+        # Use the "git merge-base branch origin/branch" command to determine
+        # whether the specified branch is ahead or behind its remote
+        # counterpart: if the best common ancestor of the two commits is one
+        # of them, that commit is behind the other. Otherwise (including when
+        # the commits share no history) the branches have diverged. Unlike
+        # "git rev-list --count", this does not need to walk all commits that
+        # differ between the two branches.
+        try:
+            merge_base = self.git.merge_base(commits[0], commits[1])
+        except git.GitCommandError:
+            merge_base = None
+        if merge_base == commits[0]:
+            status = Status.BEHIND
+        elif merge_base == commits[1]:
+            status = Status.AHEAD
+        else:
+            status = Status.DIVERGED
+        self._branch_status_cache[commits] = status
+        return status
+
+    def _upstream_status(
+        self, branch_name: str
+    ) -> Tuple[Status, refs.head.Head, Optional[git.RemoteReference]]:
+        """Returns the status of the specified branch as compared to its
+        upstream branch, along with the branch and upstream branch objects,
+        so that callers do not need to look them up again.
+        """
+        branch = self.branch(branch_name)
+        remote_branch = branch.tracking_branch()
+        if not remote_branch:
+            return Status.NO_UPSTREAM, branch, None
+        return (
+            self.branch_status(branch_name, remote_branch.name),
+            branch,
+            remote_branch,
+        )
+
+    def _fetch(
+        self,
+        remotes: Sequence[git.Remote],
+        prune: bool = False,
+        max_age: float = FETCH_TTL,
+    ) -> None:
+        """Fetch updates from the specified remotes, skipping remotes from which
+        updates were already fetched less than max_age seconds ago. This
+        avoids redundant round-trips to the remotes when several operations
+        that fetch updates are performed back-to-back.
+
+        :param remotes: remotes from which to fetch updates.
+        :param prune: if True, remote branches that no longer exist on the
+            remote are deleted.
+        :param max_age: age, in seconds, below which previously fetched
+            updates are re-used. Set to 0 to always fetch updates.
+        """
+        now = time.monotonic()
+        remotes_to_fetch = []
+        for remote in remotes:
+            if remote.name in self._last_fetch:
+                last_fetch_time, last_fetch_pruned = self._last_fetch[remote.name]
+                if now - last_fetch_time < max_age and (last_fetch_pruned or not prune):
+                    continue
+            remotes_to_fetch.append(remote)
+
+        # When fetching from several remotes, a single "git fetch --multiple"
+        # command is run, which fetches from the remotes in parallel.
+        if not remotes_to_fetch:
+            return
+        if len(remotes_to_fetch) == 1:
+            remotes_to_fetch[0].fetch(prune=prune)
+        else:
+            self.git.fetch(
+                "--multiple",
+                *(("--prune",) if prune else ()),
+                f"--jobs={min(8, len(remotes_to_fetch))}",
+                *(remote.name for remote in remotes_to_fetch),
+            )
+
+        for remote in remotes_to_fetch:
+            self._last_fetch[remote.name] = (now, prune)
+        self._invalidate_branch_index()
+
+    def fetch_updates(self, max_age: float = 0) -> None:
+        """Fetch updates from all remotes associated to the repo. By default,
+        updates are always fetched. If max_age is set, remotes from which
+        updates were fetched less than max_age seconds ago are skipped.
+        """
+        self._verify_not_static("fetch updates")
+        self._fetch(self.remotes, prune=True, max_age=max_age)
 
     def switch(self, branch_name: str) -> None:
         """Switch/checkout to the specified branch."""
 
         # If the requested branch is already checked-out, nothing to do.
-        if not self.head.is_detached and branch_name == self.active_branch.name:
+        if branch_name == active_branch_name(self):
             return
 
-        # Switch to the requested branch.
+        # Switch to the requested branch. The trailing "--" makes sure that
+        # "git checkout" interprets the branch name as a branch, never a path.
         try:
-            branch = self.branch(name=branch_name)
-            branch.checkout()
+            self.branch(name=branch_name)
+            self.git.checkout("--quiet", branch_name, "--")
         except GitRepoError as e:
             # Error case 1: the branch does not exist in the current repo.
             raise GitRepoError(f"{e} Cannot switch to '{branch_name}'.") from None
@@ -213,13 +367,23 @@ class GitRepo(git.Repo):
         """
         # If the specified reference is a local branch, fallback on the
         # `switch` command.
-        if refspec in self.branch_names:
+        if refspec in self._branch_index()[0]:
             self.switch(branch_name=refspec)
             return
 
+        # If HEAD is already detached at the commit of the specified reference,
+        # nothing to do. References that cannot be resolved are passed on to
+        # "git checkout", so that the appropriate error is raised.
+        if self.head.is_detached:
+            try:
+                if self.head.commit == self.commit(refspec):
+                    return
+            except (ValueError, git.BadName, git.BadObject):
+                pass
+
         # Checkout the specified reference in "detached head" mode.
         try:
-            self.git.checkout("--detach", refspec)
+            self.git.checkout("--quiet", "--detach", refspec)
         except git.GitCommandError as e:
             if "would be overwritten" in str(e):
                 error_msg = "repo contains uncommitted changes."
@@ -242,10 +406,14 @@ class GitRepo(git.Repo):
         """
         initial_branch = self.active_branch.name
 
+        # If the specified branch is already checked-out, there is nothing to
+        # switch upon entering or exiting the context manager.
+        if branch_or_refspec == initial_branch:
+            yield
+            return
+
         # Switch to the specified branch upon entering the context manager.
-        # Note: switch has no effect if the requested branch is already
-        # checked-out.
-        if branch_or_refspec in self.branch_names:
+        if branch_or_refspec in self._branch_index()[0]:
             self.switch(branch_name=branch_or_refspec)
         else:
             self.checkout(refspec=branch_or_refspec)
@@ -280,39 +448,53 @@ class GitRepo(git.Repo):
             possible.
         :raises GitRepoError:
         """
+        self._verify_not_static("pull branch")
+
         # Get the status of the branch to push, e.g. is it ahead or behind its
         # remote tracking branch.
         if with_fetch:
-            self.fetch_updates()
-        status = self.branch_status(branch_name)
+            self._fetch(self.remotes, prune=True)
+        status, branch, remote_branch = self._upstream_status(branch_name)
 
         # If the local branch is behind its remote tracking branch, perform
         # a git pull. Nothing to do if status is UP_TO_DATE or AHEAD.
         if status is Status.BEHIND:
-            # Get the remote associated to the branch's upstream.
-            branch = self.branch(branch_name)
-            remote_branch = cast(git.RemoteReference, branch.tracking_branch())
-            remote = self.remote(remote_branch.remote_name)
-            if self.active_branch == branch:
-                # Case 1: the branch to update is the current branch.
-                info = remote.pull(refspec=branch_name)[0]
-                if info.flags != 0 or branch.commit != remote_branch.commit:
+            remote_branch = cast(git.RemoteReference, remote_branch)
+            if active_branch_name(self) == branch.name:
+                # Case 1: the branch to update is the current branch. Since
+                # its upstream was already fetched, the working tree is
+                # fast-forwarded with a local merge, without a new round-trip
+                # to the remote.
+                try:
+                    self.git.merge("--ff-only", "--quiet", remote_branch.name)
+                except git.GitCommandError as e:
                     raise GitRepoError(
-                        f"Git command failed: git pull {remote.name} {branch_name}",
+                        "Git command failed: git merge --ff-only "
+                        f"{remote_branch.name}",
                         repo=self,
-                    )
+                    ) from e
             else:
                 # Case 2: the branch to update is not the current branch.
-                refspec = f"{branch_name}:{branch_name}"
-                info = remote.fetch(refspec=refspec)[0]
-                if (
-                    info.flags != info.FAST_FORWARD
-                    or branch.commit != remote_branch.commit
-                ):
+                # Since the branch is behind its upstream, which was already
+                # fetched, the update is a fast-forward that only requires
+                # moving the branch's reference to the upstream's commit. This
+                # avoids a new round-trip to the remote for each branch.
+                # The reference is updated with "git update-ref", which writes
+                # a reflog entry and only moves the branch if it was not
+                # modified in the meantime (compare-and-swap).
+                try:
+                    self.git.update_ref(
+                        "-m",
+                        f"stack-builder: fast-forward to {remote_branch.name}",
+                        branch.path,
+                        remote_branch.commit.hexsha,
+                        branch.commit.hexsha,
+                    )
+                except git.GitCommandError as e:
                     raise GitRepoError(
-                        f"Git command failed: git fetch {remote.name} {refspec}",
+                        f"Git command failed: git update-ref {branch.path}",
                         repo=self,
-                    )
+                    ) from e
         elif status is Status.DIVERGED and error_on_diverged:
             raise GitRepoError(
                 f"Cannot auto-update (pull) branch '{branch_name}' because it "
@@ -337,11 +519,13 @@ class GitRepo(git.Repo):
         """Perform a git push on the specified branch to the specified remote.
         Set allow_force to True to authorize --force pushes.
         """
+        self._verify_not_static("push branch")
+
         # Get the status of the branch to push, e.g. is it ahead or behind its
         # remote tracking branch.
         if with_fetch:
-            self.fetch_updates()
-        status = self.branch_status(branch_name)
+            self._fetch(self.remotes, prune=True)
+        status, _, remote_branch = self._upstream_status(branch_name)
         cmd_with_error = ""
 
         # If not remote is set, get the remote associated to the upstream
@@ -351,8 +535,7 @@ class GitRepo(git.Repo):
                 remote = self.default_remote
             else:
                 # Get the remote associated to the branch's upstream.
-                branch = self.branch(branch_name)
-                remote_branch = cast(git.RemoteReference, branch.tracking_branch())
+                remote_branch = cast(git.RemoteReference, remote_branch)
                 remote = self.remote(remote_branch.remote_name)
 
         # Perform git push with the appropriate options depending on the
@@ -363,10 +546,15 @@ class GitRepo(git.Repo):
             if info.flags != info.FAST_FORWARD:
                 cmd_with_error = "git push"
         elif status is Status.DIVERGED:
+            # The force push is made "with lease": it is only performed if
+            # the branch on the remote still points to the commit of the
+            # local remote-tracking branch, i.e. the commit the branch was
+            # compared against. Changes pushed to the remote in the meantime
+            # are thus never overwritten.
             if allow_force:
-                info = remote.push(refspec=branch_name, force=True)[0]
+                info = remote.push(refspec=branch_name, force_with_lease=branch_name)[0]
                 if info.flags != info.FORCED_UPDATE:
-                    cmd_with_error = "git push --force"
+                    cmd_with_error = "git push --force-with-lease"
             else:
                 raise GitRepoError(
                     f"Branch '{branch_name}' cannot be pushed to the "
@@ -377,6 +565,7 @@ class GitRepo(git.Repo):
                 )
         elif status is Status.NO_UPSTREAM:
             info = remote.push(refspec=branch_name, set_upstream=True)[0]
+            self._invalidate_branch_index()
             if info.flags != info.NEW_HEAD:
                 cmd_with_error = "git push --set-upstream"
 
@@ -388,7 +577,11 @@ class GitRepo(git.Repo):
             )
 
     def new_branch(
-        self, name: str, root_commit: str = "HEAD", raise_error_if_exists: bool = False
+        self,
+        name: str,
+        root_commit: str = "HEAD",
+        raise_error_if_exists: bool = False,
+        with_fetch: bool = True,
     ) -> None:
         """Create a new branch with the specified name. If a branch with that
         name already exists on the default remote, the new branch is created
@@ -401,7 +594,13 @@ class GitRepo(git.Repo):
         :param raise_error_if_exists: if True, and error is raised when
             attempting to create a new branch that already exists. If False,
             no action is taken if the branch already exists.
+        :param with_fetch: if True, a git fetch is performed on all remotes
+            before checking whether one has a branch with the same name. Callers
+            that have just fetched updates can set this to False to avoid an
+            extra round-trip to the remotes.
         """
+        self._verify_not_static("create new branch")
+
         # If the branch already exists, do nothing or raise an error if the
         # user asked for it.
         if name in self.branch_names:
@@ -414,19 +613,36 @@ class GitRepo(git.Repo):
 
         # Create a new local branch.
         new_branch = self.create_head(name, commit=root_commit)
+        self._invalidate_branch_index()
 
         # If a remote branch with the same name exists, set the local branch
-        # to track that remote branch.
+        # to track that remote branch. Updates from all remotes are fetched
+        # at once before looking for the remote branch.
+        if with_fetch:
+            self._fetch(self.remotes)
+        remote_branches = self._branch_index()[1]
         for remote in self.remotes:
-            remote.fetch()
-            if f"{remote.name}/{name}" in self.remote_branch_names:
-                new_branch.commit = f"{remote.name}/{name}"
-                new_branch.set_tracking_branch(
-                    remote_reference=self.remote_branch(name, remote)
-                )
+            remote_branch = remote_branches.get(f"{remote.name}/{name}")
+            if remote_branch:
+                new_branch.commit = remote_branch.commit
+                new_branch.set_tracking_branch(remote_reference=remote_branch)
                 return
         return
 
+    def delete_branch(self, name: str) -> None:
+        """Delete the specified local branch. The branch must be fully merged
+        into its upstream branch or into HEAD, otherwise an error is raised.
+        """
+        self._verify_not_static("delete branch")
+        try:
+            self.git.branch("-d", name)
+        except git.GitCommandError as e:
+            raise GitRepoError(
+                f"Git command failed: git branch -d {name}", repo=self
+            ) from e
+        finally:
+            self._invalidate_branch_index()
+
     def reset_branch(self, branch: git.Head, ref_to_reset_to: str) -> None:
         """Reset the specified branch to the specified reference, for instance
         a commit or another branch.
@@ -436,7 +652,9 @@ class GitRepo(git.Repo):
             branch, to which the branch should be reset to.
         :raises GitRepoError:
         """
-        if self.active_branch == branch:
+        self._verify_not_static("reset branch")
+
+        if active_branch_name(self) == branch.name:
             # If the branch to reset is the current branch, the index and the
             # working tree must also be updated so that they match the
             # specified reference.
@@ -467,9 +685,11 @@ class GitRepo(git.Repo):
 
         If the branch has no upstream, an error is raised.
         """
+        self._verify_not_static("reset branch")
+
         # Fetch updates from the remote.
         if with_fetch:
-            self.fetch_updates()
+            self._fetch(self.remotes, prune=True)
 
         # Set the branch's reference (pointer) to the upstream's reference.
         branch = self.branch(branch_name)
@@ -490,13 +710,47 @@ class GitRepo(git.Repo):
         rebase_location: str,
         with_fetch: bool = True,
     ) -> None:
-        """Rebase the specified branch on the specified rebase_location."""
+        """Rebase the specified branch on the specified rebase_location, which
+        can be any reference, e.g. a branch, a remote branch or a commit.
+        """
+        self._verify_not_static("rebase branch")
+
         if with_fetch:
-            self.fetch_updates()
+            self._fetch(self.remotes, prune=True)
+
+        try:
+            rebase_commit = self.commit(rebase_location).hexsha
+        except (ValueError, git.BadName):
+            raise GitRepoError(
+                f"Cannot rebase branch '{branch_name}' on '{rebase_location}': "
+                "reference does not exist in repo.",
+                repo=self,
+            ) from None
+
+        # If the branch already contains all commits of the rebase location,
+        # there is nothing to rebase. If the branch is exactly behind the
+        # rebase location, rebasing is the same as a fast-forward, which is
+        # done with a hard-reset (provided that the working tree is clean or
+        # that the branch is not the currently active branch).
+        status = self._commit_status(
+            self.branch(branch_name).commit.hexsha, rebase_commit
+        )
+        if status in (Status.UP_TO_DATE, Status.AHEAD):
+            return
+        if status is Status.BEHIND:
+            try:
+                self.reset_branch(
+                    branch=self.branch(branch_name), ref_to_reset_to=rebase_location
+                )
+                return
+            except GitRepoError:
+                # If the branch to rebase is the currently active branch and
+                # the repository is dirty, an error is raised.
+                pass
 
         with self.switch_to_branch(branch_name):
             try:
-                self.git.rebase(rebase_location)
+                self.git.rebase("--quiet", rebase_location)
             except git.GitCommandError as e:
                 self.git.rebase("--abort")
                 raise GitRepoError(
@@ -512,6 +766,7 @@ class GitRepo(git.Repo):
         branch_to_merge: str,
     ) -> None:
         """Merges branch "branch_to_merge" into the specified branch."""
+        self._verify_not_static("merge branch")
 
         # If the branch to merge into is exactly behind the branch to merge,
         # a fast-forward merge is possible (provided that the working tree is
@@ -547,15 +802,63 @@ class GitRepo(git.Repo):
     def grep_history(self, search_term: str, branch_name: str) -> str:
         """Search for the specified pattern on the specified branch, but only in
         the part of the history that diverges from the "develop" branch.
+        Matching commits are returned one per line, in the form
+        "<abbreviated hash> <subject>".
         """
+        # Note: an explicit format is used rather than "--oneline", whose
+        # output can include ref names depending on the user's config.
         return self.git.log(
-            "--oneline",
+            "--format=%h %s",
             "--grep",
             search_term,
             f"{self.main_branch_name}..{branch_name}",
         )
 
 
+@functools.lru_cache(maxsize=128)
+def _open_repo(
+    path: str, main_branch_name: str, main_remote_name: str, static: bool
+) -> GitRepo:
+    return GitRepo(
+        path,
+        main_branch_name=main_branch_name,
+        main_remote_name=main_remote_name,
+        static=static,
+    )
+
+
+def open_repo(
+    path: str,
+    main_branch_name: str = "main",
+    main_remote_name: str = "origin",
+    static: bool = False,
+) -> GitRepo:
+    """Returns a GitRepo object for the Git repo at the specified path. Repos
+    are only opened once for a given path and set of options, after which the
+    same GitRepo object is returned.
+    The path is normalized but symlinks are not resolved, since the path of the
+    repo is compared with other, non-resolved, paths.
+    """
+    return _open_repo(
+        os.path.abspath(os.path.expanduser(path)),
+        main_branch_name,
+        main_remote_name,
+        static,
+    )
+
+
+def active_branch_name(repo: git.Repo) -> Optional[str]:
+    """Returns the name of the currently checked-out branch of the specified
+    repo, or None if the repo is in "detached head" mode.
+    """
+    # Note: HEAD is only read once, as accessing the branch HEAD points to
+    # raises a TypeError if HEAD is detached.
+    try:
+        return repo.head.ref.name
+    except TypeError:
+        return None
+
+
 def switch_to_branch_if_repo(
     repo: Optional[GitRepo], branch: Optional[str]
 ) -> ContextManager[None]:
@@ -568,9 +871,4 @@ def switch_to_branch_if_repo(
         return repo.switch_to_branch(branch, revert_on_exit=True)
     if repo and not branch:
         raise ValueError("Either both or neither 'repo' and 'branch' should be 'None'.")
-
-    # Note: to support python 3.6, return contextlib.suppress().
-    #       This can be removed once support for 3.6 is no longer needed.
-    if sys.version_info >= (3, 7):
-        return contextlib.nullcontext()
-    return contextlib.suppress()
+    return NULL_CONTEXT
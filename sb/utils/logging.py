@@ -18,57 +18,48 @@ def print_summary_start(
 ) -> None:
     """Print input data summary."""
 
-    pkgs_not_found = [x for x in pkgs_to_build if x not in easyconfigs_to_build]
-    pkgs_to_build_info = [
-        f"{x} [{easyconfigs_to_build[x].path}] [branch={easyconfigs_to_build[x].branch}]"
-        for x in pkgs_to_build
-        if x not in pkgs_not_found
-    ]
-    print(
-        "#" * 100 + "\n",
-        "### EasyBuild config:\n",
-        "###  -> builddir   : " + str(sb_config.buildpath) + "\n",
-        "###  -> installdir : " + str(sb_config.installpath) + "\n",
-        "###  -> robot-paths: " + str([str(x) for x in sb_config.robot_paths]) + "\n",
-        "###  -> SIB EasyConfig repo: "
-        + str(sb_config.sib_easyconfigs_repo.path)
-        + "\n",
-        "###  -> SIB SoftStack repo: "
-        + str(sb_config.sib_software_stack_repo.path)
-        + "\n",
-        "###  -> optarch    : " + str(sb_config.optarch) + "\n",
-        "###  -> job-cores  : " + str(sb_config.job_cores) + "\n",
-        "### \n",
-        "### Build summary:\n",
-        "###  -> build_from_scratch: " + str(build_from_scratch) + "\n",
-        "###  -> no_avx2           : " + str(no_avx2) + "\n",
-        "###  -> dry_run           : " + str(dry_run) + "\n",
-        "###  -> Node name         : " + sb_config.sib_node.value + "\n",
-        "### ",
-        sep="",
-    )
-    if pkgs_already_built:
-        print(
-            "### Packages already built:\n",
-            "###  -> " + "\n###  -> ".join(pkgs_already_built) + "\n",
-            "### ",
-            sep="",
-        )
+    pkgs_not_found = []
+    pkgs_to_build_info = []
+    for x in pkgs_to_build:
+        easyconfig = easyconfigs_to_build.get(x)
+        if easyconfig:
+            pkgs_to_build_info.append(
+                f"{x} [{easyconfig.path}] [branch={easyconfig.branch}]"
+            )
+        else:
+            pkgs_not_found.append(x)
     if not pkgs_to_build_info:
         pkgs_to_build_info = ["All packages already built - nothing to do."]
-    print(
-        "### Packages to build:\n",
-        "###  -> " + "\n###  -> ".join(pkgs_to_build_info) + "\n",
+
+    # The summary is assembled line by line and printed at once.
+    lines = [
+        "#" * 100,
+        "### EasyBuild config:",
+        f"###  -> builddir   : {sb_config.buildpath}",
+        f"###  -> installdir : {sb_config.installpath}",
+        f"###  -> robot-paths: {sb_config.robot_paths}",
+        f"###  -> SIB EasyConfig repo: {sb_config.sib_easyconfigs_repo.path}",
+        f"###  -> SIB SoftStack repo: {sb_config.sib_software_stack_repo.path}",
+        f"###  -> optarch    : {sb_config.optarch}",
+        f"###  -> job-cores  : {sb_config.job_cores}",
         "### ",
-        sep="",
-    )
-    if pkgs_not_found:
-        print(
-            "### Packages not found:\n",
-            "###  -> " + "\n###  -> ".join(pkgs_not_found) + "\n",
-            "### ",
-            sep="",
-        )
+        "### Build summary:",
+        f"###  -> build_from_scratch: {build_from_scratch}",
+        f"###  -> no_avx2           : {no_avx2}",
+        f"###  -> dry_run           : {dry_run}",
+        f"###  -> Node name         : {sb_config.sib_node.value}",
+        "### ",
+    ]
+    for title, pkgs in (
+        ("Packages already built", pkgs_already_built),
+        ("Packages to build", pkgs_to_build_info),
+        ("Packages not found", pkgs_not_found),
+    ):
+        if pkgs:
+            lines.append(f"### {title}:")
+            lines.extend(f"###  -> {x}" for x in pkgs)
+            lines.append("### ")
+    print("\n".join(lines))
 
 
 def print_summary_end(
@@ -77,19 +68,18 @@ def print_summary_end(
     """Print end of command summary, e.g. build times."""
 
     # Display end summary info (build times).
-    print(
+    lines = [
         f"### Completed {eb_cmd_description} successfully in {timer.total_time_as_str}."
-    )
+    ]
     if not dry_run:
-        build_times = [
-            f"{x}: {timer.recorded_times_as_str[index]}"
-            for index, x in enumerate(pkgs_to_build)
-        ]
-        build_times.append(f"Total time: {timer.total_time_as_str}")
-        print(
-            "### Build times (including dependencies):\n",
-            "###  - " + "\n###  - ".join(build_times) + "\n",
-            sep="",
+        lines.append("### Build times (including dependencies):")
+        lines.extend(
+            f"###  - {x}: {build_time}"
+            for x, build_time in zip(pkgs_to_build, timer.recorded_times_as_str)
         )
+        lines.append(f"###  - Total time: {timer.total_time_as_str}")
+        lines.append("")
 
-    print("#" * 100 + "\n")
+    lines.append("#" * 100)
+    lines.append("")
+    print("\n".join(lines))
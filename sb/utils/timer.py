@@ -1,7 +1,6 @@
 """Timer related classes and functions."""
 
 import time
-import datetime
 
 from typing import List
 
@@ -19,8 +18,17 @@ class Timer:
     """
 
     def __init__(self, start_timer: bool = False):
-        self._start_time: float = -1.0
+        # Start time of the current lap, in nanoseconds. The value is taken
+        # from a monotonic clock, which is not affected by system clock
+        # updates. A negative value indicates that the timer is not running.
+        self._start_time: int = -1
         self.recorded_times: List[float] = []
+
+        # The total time and the string representation of the recorded times
+        # are updated with each new lap, so they do not need to be recomputed
+        # each time they are accessed.
+        self._total_time: float = 0.0
+        self._recorded_times_as_str: List[str] = []
         if start_timer:
             self.start()
 
@@ -37,19 +45,24 @@ class Timer:
         self._verify_is_stopped()
         if reset:
             self.recorded_times = []
-        self._start_time = time.time()
+            self._total_time = 0.0
+            self._recorded_times_as_str = []
+        self._start_time = time.monotonic_ns()
 
     def lap(self) -> None:
         """Record a new value."""
         self._verify_is_running()
-        lap_time = time.time()
-        self.recorded_times.append(lap_time - self._start_time)
+        lap_time = time.monotonic_ns()
+        elapsed_time = (lap_time - self._start_time) / 1e9
+        self.recorded_times.append(elapsed_time)
+        self._total_time += elapsed_time
+        self._recorded_times_as_str.append(_seconds_to_str(elapsed_time))
         self._start_time = lap_time
 
     def stop(self) -> None:
         """Stop the timer."""
         self.lap()
-        self._start_time = -1.0
+        self._start_time = -1
 
     @property
     def last_time(self) -> float:
@@ -59,14 +72,27 @@ class Timer:
     @property
     def total_time(self) -> float:
         """Total time (in seconds) elapsed since the timer was started."""
-        return sum(self.recorded_times)
+        return self._total_time
 
     @property
     def total_time_as_str(self) -> str:
         """Formal total time as string."""
-        return str(datetime.timedelta(seconds=round(self.total_time)))
+        return _seconds_to_str(self._total_time)
 
     @property
     def recorded_times_as_str(self) -> List[str]:
         """Format recorded times as strings."""
-        return [str(datetime.timedelta(seconds=round(x))) for x in self.recorded_times]
+        return self._recorded_times_as_str
+
+
+def _seconds_to_str(seconds: float) -> str:
+    """Format a time in seconds as a "H:MM:SS" string, with the same output
+    as `str(datetime.timedelta(seconds=round(seconds)))` for positive times.
+    """
+    minutes, seconds = divmod(round(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    days, hours = divmod(hours, 24)
+    time_str = f"{hours}:{minutes:02d}:{seconds:02d}"
+    if days:
+        return f"{days} day{'s' if days != 1 else ''}, {time_str}"
+    return time_str
@@ -2,14 +2,16 @@
 
 import os
 import re
-import sys
 import shutil
 import subprocess  # nosec
-from pathlib import Path
-from typing import Sequence, Optional, Iterator, Union
+import sys
+from typing import Sequence, Optional, Iterator, Tuple, Union, List
 
 from .config import UserAnswer
 
+# Maximum total length, in bytes, of the paths passed to a single "rm" command.
+RM_MAX_ARGS_LENGTH = 64 * 1024
+
 
 def create_directory(
     dir_paths: Union[str, Sequence[str]], raise_error_if_exists: bool = False
@@ -19,21 +21,18 @@ def create_directory(
         dir_paths = (dir_paths,)
 
     for dir_path in dir_paths:
-        # Check whether the directory to create already exists.
-        dir_to_create = Path(os.path.expanduser(dir_path))
-        if dir_to_create.is_dir():
-            if raise_error_if_exists:
+        # Recursively create the new directory. A single call is made to the
+        # file system: if something already exists at the location of the new
+        # directory, it is only then checked whether it is a directory.
+        dir_to_create = os.path.expanduser(dir_path)
+        try:
+            os.makedirs(dir_to_create, exist_ok=not raise_error_if_exists)
+        except FileExistsError:
+            if os.path.isdir(dir_to_create):
                 raise ValueError(
                     f"Cannot create directory '{dir_to_create}' as it "
                     "already exists."
-                )
-            continue
-
-        # Recursively create the new dictroy. If a file/symlink with the same
-        # name already exists, an error is raised.
-        try:
-            dir_to_create.mkdir(parents=True, exist_ok=False)
-        except FileExistsError:
+                ) from None
             raise ValueError(
                 f"Cannot create directory '{dir_to_create}'. "
                 "A file/symlink with the same name already exists."
@@ -46,39 +45,90 @@ def delete_directory_content(
     """Recursively delete the entire content of the specified directory(ies),
     but not the directory(ies) itself.
     """
-    for dir_path in map(Path, dir_paths):
-        if not dir_path.is_dir():
+    for dir_path in dir_paths:
+        if not os.path.isdir(dir_path):
             raise ValueError(f"Cannot delete content of [{dir_path}]: not a directory.")
 
-        if dry_run:
-            for path in dir_path.iterdir():
-                print(
-                    f"Would have deleted {'directory' if path.is_dir() else 'file'}:",
-                    path,
-                )
+        with os.scandir(dir_path) as entries:
+            if dry_run:
+                for entry in entries:
+                    print(
+                        "Would have deleted "
+                        f"{'directory' if entry.is_dir() else 'file'}:",
+                        entry.path,
+                    )
+                continue
+            paths = [entry.path for entry in entries]
+
+        if verbose:
+            print(f"Deleting content of: {dir_path}")
+        delete_paths(paths)
+
+
+def delete_paths(paths: Sequence[str]) -> None:
+    """Recursively delete the specified files and directories.
+
+    When available, all paths are deleted with a single "rm -rf" command,
+    which is substantially faster than shutil.rmtree for directories
+    containing many files (e.g. EasyBuild build directories).
+    """
+    if not paths:
+        return
+
+    if shutil.which("rm"):
+        # The paths are passed to "rm" in batches, so that the length of the
+        # command line never exceeds the system limit (ARG_MAX), which is at
+        # least 128 KiB on all supported systems.
+        batch: List[str] = []
+        batch_length = 0
+        for path in paths:
+            path_length = len(os.fsencode(path)) + 1
+            if batch and batch_length + path_length > RM_MAX_ARGS_LENGTH:
+                run_subprocess(["rm", "-rf", "--", *batch], capture_output=False)
+                batch, batch_length = [], 0
+            batch.append(path)
+            batch_length += path_length
+        run_subprocess(["rm", "-rf", "--", *batch], capture_output=False)
+        return
+
+    for path in paths:
+        if os.path.isdir(path) and not os.path.islink(path):
+            shutil.rmtree(path)
         else:
-            if verbose:
-                print(f"Deleting content of: {dir_path}")
-            for path in dir_path.iterdir():
-                if path.is_dir():
-                    shutil.rmtree(path)
-                else:
-                    path.unlink()
+            os.unlink(path)
 
 
 def get_files_from_directory(
-    dir_path: str, extension: Optional[str] = None, full_path: bool = True
+    dir_path: str,
+    extension: Optional[Union[str, Tuple[str, ...]]] = None,
+    full_path: bool = True,
 ) -> Iterator[str]:
     """Returns all files found (recursively) in the specied directory.
 
-    If an extension is specified, only the files with that extension are
-    returned.
+    If an extension, or a tuple of extensions, is specified, only the files
+    with that extension(s) are returned.
+
+    Directories are traversed in the same order as os.walk (top-down, without
+    following symlinks to directories), but using os.scandir directly so that
+    the file type of each entry is not looked-up a second time.
     """
-    for root, _, files in os.walk(os.path.expanduser(dir_path)):
-        if extension:
-            files = [f for f in files if f.endswith(extension)]
-        for f in files:
-            yield os.path.join(root, f) if full_path else f
+    dirs_to_scan = [os.path.expanduser(dir_path)]
+    while dirs_to_scan:
+        sub_dirs = []
+        try:
+            with os.scandir(dirs_to_scan.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        if not entry.is_symlink():
+                            sub_dirs.append(entry.path)
+                    elif not extension or entry.name.endswith(extension):
+                        yield entry.path if full_path else entry.name
+        except OSError:
+            continue
+
+        # Sub-directories are added in reverse order, so that they are scanned
+        # in the order in which they were listed.
+        dirs_to_scan.extend(reversed(sub_dirs))
 
 
 def run_subprocess(
@@ -91,23 +141,24 @@ def run_subprocess(
     if so, raises an error.
     """
     if dry_run:
-        print("Would have run: " + " ".join(args))
+        print("Would have run:", *args)
         return None
 
     try:
-        if sys.version_info.minor >= 7:
-            # nosec
-            process = subprocess.run(
-                args=args, capture_output=capture_output, check=True, shell=False
-            )
-        else:
-            # nosec
-            process = subprocess.run(args=args, check=True, shell=False)
+        # nosec
+        # The captured output is decoded while it is read.
+        process = subprocess.run(
+            args=args,
+            capture_output=capture_output,
+            check=True,
+            shell=False,
+            encoding="utf-8",
+        )
     except subprocess.CalledProcessError as e:
         raise ValueError(f"subprocess command failed: {' '.join(args)}") from e
 
     if return_stdout:
-        return process.stdout.decode("utf-8").strip()
+        return process.stdout.strip()
 
     return None
 
@@ -121,4 +172,14 @@ def user_confirmation_dialog(*messages: str) -> UserAnswer:
         "stack-builder config file.\n"
         "###          Are you sure you want to proceed [yes/y/no/n]?: "
     )
-    return UserAnswer.YES if input(msg).lower() in ("y", "yes") else UserAnswer.NO
+
+    # When the answer is not typed by a user (e.g. it is piped in), the prompt
+    # is written and the answer read directly, bypassing the line editing
+    # hooks of input(). If no answer is given at all, it counts as a "no".
+    if sys.stdin.isatty():
+        answer = input(msg)
+    else:
+        sys.stdout.write(msg)
+        sys.stdout.flush()
+        answer = sys.stdin.readline().strip()
+    return UserAnswer.YES if answer.lower() in ("y", "yes") else UserAnswer.NO
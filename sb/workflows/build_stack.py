@@ -2,8 +2,8 @@
 updates the local instance of the SIB software stack.
 """
 
+import itertools
 import os
-import shutil
 from contextlib import contextmanager
 from typing import Generator
 
@@ -16,6 +16,7 @@ from ..utils.config import (
 from ..utils.easyconfigs import find_easyconfigs, install_license_files
 from ..utils.utils import (
     delete_directory_content,
+    delete_paths,
     run_subprocess,
     user_confirmation_dialog,
 )
@@ -26,7 +27,8 @@ from ..utils.logging import print_summary_start, print_summary_end
 
 @contextmanager
 def clean_eb_tmp_files(sb_config: StackBuilderConfig) -> Generator:
-    """Delete any 'eb-*' directories that are found in the /tmp directory.
+    """Delete any 'eb-*' directories that are found in the /tmp directory, as
+    well as the content of the EasyBuild build directory.
 
     Note that this context manager will not clean the tmp files if an error
     occurs while it is active. This is on purpose, so that the EasyBuild log
@@ -34,16 +36,25 @@ def clean_eb_tmp_files(sb_config: StackBuilderConfig) -> Generator:
     """
 
     def clean_eb_tmp_path() -> None:
-        for dir_name in [x for x in os.listdir("/tmp") if x.startswith("eb-")]:
-            shutil.rmtree(os.path.join("/tmp", dir_name))
+        # The 'eb-*' directories and the content of the build directory are
+        # deleted together, with a single call to delete_paths. The file type
+        # of the /tmp entries is served from the directory listing itself, so
+        # filtering on it costs no additional stat call.
+        with os.scandir("/tmp") as entries:
+            paths = [
+                x.path
+                for x in entries
+                if x.name.startswith("eb-") and x.is_dir(follow_symlinks=False)
+            ]
+        with os.scandir(sb_config.buildpath) as entries:
+            paths.extend(x.path for x in entries)
+        delete_paths(paths)
 
     # No "try: finally:"" block around the yield statement, because the desired
     # behavior is that the cleaning does not occur on error.
     clean_eb_tmp_path()
-    delete_directory_content(sb_config.buildpath)
     yield None
     clean_eb_tmp_path()
-    delete_directory_content(sb_config.buildpath)
 
 
 def build_stack(
@@ -56,7 +67,9 @@ def build_stack(
 
     # Load the EasyBuild and StackBuilder configuration values. Make sure that
     # the local node's branch is checked-out in the Git repos.
-    sb_config = load_config()
+    # The build workflow never creates or updates branches, so the repos are
+    # opened in static mode, where their branches are only listed once.
+    sb_config = load_config(static_repos=True)
     sb_config.sib_easyconfigs_repo.switch(sb_config.node_branch_name)
     sb_config.sib_software_stack_repo.switch(sb_config.node_branch_name)
 
@@ -121,24 +134,31 @@ def build_stack(
 
     print(f"### Starting {eb_cmd_description}:")
     timer = Timer(start_timer=True)
-    for easyconfig_name in pkgs_to_build:
 
-        easyconfig = easyconfigs_to_build[easyconfig_name]
-        assert easyconfig.name == easyconfig_name
-
-        with clean_eb_tmp_files(sb_config), switch_to_branch_if_repo(
-            easyconfig.repo, easyconfig.branch
-        ):
-            eb_args = eb_cmd_arguments + [easyconfig.full_name]
-            print(
-                f"### -> Building {easyconfig.full_name} [branch={easyconfig.branch}]\n"
-                f"###    EasyBuild command: {' '.join(eb_args)}"
-            )
-            run_subprocess(
-                args=eb_args, capture_output=False, return_stdout=False, dry_run=False
-            )
-            timer.lap()
-            print("###")
+    # Consecutive easyconfigs from the same repo and branch are built without
+    # switching back and forth between branches: the branch is checked-out
+    # once per group. The build order of the packages is preserved.
+    for repo_and_branch, easyconfigs in itertools.groupby(
+        (easyconfigs_to_build[x] for x in pkgs_to_build),
+        key=lambda x: (x.repo, x.branch),
+    ):
+        with switch_to_branch_if_repo(*repo_and_branch):
+            for easyconfig in easyconfigs:
+                with clean_eb_tmp_files(sb_config):
+                    eb_args = eb_cmd_arguments + [easyconfig.full_name]
+                    print(
+                        f"### -> Building {easyconfig.full_name} "
+                        f"[branch={easyconfig.branch}]\n"
+                        f"###    EasyBuild command: {' '.join(eb_args)}"
+                    )
+                    run_subprocess(
+                        args=eb_args,
+                        capture_output=False,
+                        return_stdout=False,
+                        dry_run=False,
+                    )
+                    timer.lap()
+                    print("###")
 
     # Display end summary info (build times).
     print_summary_end(eb_cmd_description, timer, pkgs_to_build, dry_run)
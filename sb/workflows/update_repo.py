@@ -1,6 +1,10 @@
 """Functions and classes of the "update repo" workflow."""
 
-from ..utils.git import GitRepo, Status
+from typing import Dict, Optional, Sequence, cast
+
+import git
+
+from ..utils.git import GitRepo, GitRepoError, Status
 from ..utils.config import (
     StackBuilderConfig,
     UserAnswer,
@@ -12,7 +16,10 @@ from ..utils.utils import user_confirmation_dialog
 
 
 def pull_or_reset_to_upstream(
-    branch_name: str, repo: GitRepo, allow_reset: UserAnswer
+    branch_name: str,
+    repo: GitRepo,
+    allow_reset: UserAnswer,
+    status: Optional[Status] = None,
 ) -> None:
     """Updates the specified branch by either:
      * Pulling changes from the branch's upstream if the branch is behind
@@ -26,11 +33,14 @@ def pull_or_reset_to_upstream(
     :param allow_reset: whether the resetting of the branch, if needed, should
         be allowed automatically, not allowed, or will prompt the user for
         an interactive answer.
+    :param status: optional. Status of the branch as compared to its upstream
+        branch, if already known.
     """
 
     # Determine branch status. If the branch is up-to-date or ahead of its
     # remote tracking branch, there is nothing to do.
-    status = repo.branch_status(branch_name)
+    if status is None:
+        status = repo.branch_status(branch_name)
     if status in (Status.UP_TO_DATE, Status.AHEAD):
         print(f"###  -> branch '{branch_name}' is up-to-date with its upstream.")
         return
@@ -68,20 +78,62 @@ def pull_or_reset_to_upstream(
     return
 
 
-def update_local_repo(repo: GitRepo, sb_config: StackBuilderConfig) -> None:
+def _upstream_statuses(repo: GitRepo) -> Dict[str, Status]:
+    """Determines the status of all local branches of the repo as compared to
+    their upstream branch, using a single "git for-each-ref" command instead
+    of one command per branch.
+    Branches whose upstream branch no longer exists are not included in
+    the returned dictionary.
+    """
+    statuses: Dict[str, Status] = {}
+    for line in repo.git.for_each_ref(
+        "--format=%(refname)%00%(upstream)%00%(upstream:track)", "refs/heads"
+    ).splitlines():
+        ref_name, upstream, track = line.split("\0")
+        branch_name = ref_name[len("refs/heads/") :]
+        if not upstream:
+            statuses[branch_name] = Status.NO_UPSTREAM
+            continue
+        if track == "[gone]":
+            continue
+
+        # The "track" value is of the form "[ahead N, behind M]", where
+        # each part is omitted if its count is zero.
+        ahead, behind = "ahead" in track, "behind" in track
+        if ahead and behind:
+            statuses[branch_name] = Status.DIVERGED
+        elif ahead:
+            statuses[branch_name] = Status.AHEAD
+        elif behind:
+            statuses[branch_name] = Status.BEHIND
+        else:
+            statuses[branch_name] = Status.UP_TO_DATE
+    return statuses
+
+
+def update_local_repo(
+    repo: GitRepo, sb_config: StackBuilderConfig, with_fetch: bool = True
+) -> None:
     """Update all branches of the specified Git repository.
 
     :param repo: git repository to update, as a GitRepo object.
     :param sb_config: stack-builder config.
+    :param with_fetch: if False, updates are not fetched from the remotes,
+        e.g. because they were just fetched by the caller.
     :raises ValueError:
     """
 
+    # Fetch updates for the repo. This is the only fetch made while updating
+    # the repo: all operations below re-use the fetched updates.
+    if with_fetch:
+        repo.fetch_updates()
+
     # Verify that the repo has at least 2 branches: the main branch, and the
     # SIB node's own local branch. If the latter is missing, it is created.
     main_branch = repo.main_branch_name
     node_branch = sb_config.node_branch_name
     if node_branch not in repo.branch_names:
-        repo.new_branch(node_branch, root_commit=main_branch)
+        repo.new_branch(node_branch, root_commit=main_branch, with_fetch=False)
         remote_node_branch = f"{repo.default_remote.name}/{node_branch}"
         if remote_node_branch in repo.remote_branch_names:
             print(
@@ -93,20 +145,26 @@ def update_local_repo(repo: GitRepo, sb_config: StackBuilderConfig) -> None:
             repo.push_branch(node_branch)
             print(f"###  -> pushed new branch to remote '{remote_node_branch}'.")
 
-    assert node_branch in repo.branch_names and main_branch in repo.branch_names
+    # No branches are created or deleted past this point, so the list of local
+    # branch names is retrieved only once.
+    branch_names = frozenset(repo.branch_names)
+    assert node_branch in branch_names and main_branch in branch_names
 
-    # Fetch updates for the repo and pull changes for the main branch and the
-    # node's local branch:
+    # Pull changes for the main branch and the node's local branch:
     #  -> If the main branch has diverged from its upstream, i.e. it cannot be
     #     fast-forwarded, an error is raised.
     #  -> If the node branch has diverged, it is either reset or an error is
     #     raised, depending on the user settings.
-    repo.fetch_updates()
+    # The status of all branches is retrieved at once. Updating a local branch
+    # does not change the status of other branches.
+    upstream_statuses = _upstream_statuses(repo)
     for branch, allow_reset in (
         (main_branch, UserAnswer.NO),
         (node_branch, sb_config.allow_reset_node_branch),
     ):
-        pull_or_reset_to_upstream(branch, repo, allow_reset)
+        pull_or_reset_to_upstream(
+            branch, repo, allow_reset, status=upstream_statuses.get(branch)
+        )
 
     # Rebase or merge the local node's branch on/into the main branch,
     # if needed.
@@ -139,20 +197,64 @@ def update_local_repo(repo: GitRepo, sb_config: StackBuilderConfig) -> None:
     # Update local instances of branches from all other nodes (if any).
     # In principle this should be infrequent, as there is no need for a local
     # node to have a local copy of other node's branches.
-    for branch in set(sb_config.other_node_branch_names) & set(repo.branch_names):
+    for branch in sb_config.other_node_branch_names:
+        if branch not in branch_names:
+            continue
         pull_or_reset_to_upstream(
-            branch, repo, allow_reset=sb_config.allow_reset_other_nodes_branch
+            branch,
+            repo,
+            allow_reset=sb_config.allow_reset_other_nodes_branch,
+            status=upstream_statuses.get(branch),
         )
 
 
-def update_from_easybuild_upstream(sb_config: StackBuilderConfig) -> None:
+def _remote_branch_tips(
+    repo: GitRepo, remote_name: str, branch_names: Sequence[str]
+) -> Dict[str, str]:
+    """Returns the commit hexsha of the specified branches on the remote,
+    as currently found on the remote server. A single "git ls-remote" call
+    is made, which does not fetch any objects. Branches that do not exist
+    on the remote are omitted from the returned dict.
+
+    :param repo: Git repo whose remote should be queried.
+    :param remote_name: name of the remote to query.
+    :param branch_names: names of the branches to look-up on the remote.
+    :raises GitRepoError:
+    """
+    try:
+        output = cast(
+            str,
+            repo.git.ls_remote(
+                "--heads", remote_name, *(f"refs/heads/{x}" for x in branch_names)
+            ),
+        )
+    except git.GitCommandError:
+        raise GitRepoError(
+            f"Unable to list branches of remote '{remote_name}'.", repo=repo
+        ) from None
+
+    tips = {}
+    for line in output.splitlines():
+        hexsha, _, ref_name = line.partition("\t")
+        branch_name = ref_name[len("refs/heads/") :]
+        if branch_name in branch_names:
+            tips[branch_name] = hexsha
+    return tips
+
+
+def update_from_easybuild_upstream(sb_config: StackBuilderConfig) -> bool:
     """Update the "develop" and "main" branches from the SIB remote and local
     copy of the repo with updates from the official EasyBuild GitHub
     repository.
+
+    :returns: True if updates were fetched from all remotes of the repo,
+        False if the SIB remote was already up-to-date and nothing was fetched.
     """
 
     # If needed, add the official EasyBuild upstream GitHub repo as a remote
     # to the local sib-easyconfigs repo.
+    # Note: repo.remote() already verifies that the remote exists, by reading
+    # the repo's config file in-process.
     repo = sb_config.sib_easyconfigs_repo
     try:
         eb_remote = repo.remote(EB_OFFICIAL_REPO_NAME)
@@ -160,7 +262,23 @@ def update_from_easybuild_upstream(sb_config: StackBuilderConfig) -> None:
         eb_remote = repo.create_remote(EB_OFFICIAL_REPO_NAME, EB_OFFICIAL_REPO)
         # To delete a remote: repo.delete_remote(eb_remote)
 
-    assert eb_remote.exists()
+    # Compare the branch tips of the official EasyBuild remote, as currently
+    # found on the remote server, with the SIB remote branches as of the last
+    # fetch. If they are all identical, the SIB remote is up-to-date and no
+    # updates need to be fetched. The SIB remote itself is not queried, as it
+    # is fetched afterwards in any case: a single network operation is thus
+    # made when there is nothing to update.
+    branch_names = (repo.main_branch_name, "main")
+    eb_tips = _remote_branch_tips(repo, eb_remote.name, branch_names)
+    sib_tips = {
+        x: repo.remote_branch(x).commit.hexsha
+        for x in branch_names
+        if f"{repo.default_remote.name}/{x}" in repo.remote_branch_names
+    }
+    if all(x in sib_tips and sib_tips[x] == eb_tips.get(x) for x in branch_names):
+        for branch_name in branch_names:
+            print(f"###  -> branch '{branch_name}' is up-to-date, nothing to do.")
+        return False
 
     # Get updates for both the SIB and official EasyBuild remotes.
     repo.fetch_updates()
@@ -169,7 +287,7 @@ def update_from_easybuild_upstream(sb_config: StackBuilderConfig) -> None:
     # remote.
     # Note: if the status of the branch to update is already UP_TO_DATE there
     # is nothing to do.
-    for branch_name in (repo.main_branch_name, "main"):
+    for branch_name in branch_names:
         sib_branch = f"{repo.default_remote.name}/{branch_name}"
         eb_branch = f"{eb_remote.name}/{branch_name}"
         status = repo.branch_status(
@@ -187,10 +305,10 @@ def update_from_easybuild_upstream(sb_config: StackBuilderConfig) -> None:
             # This will raise an error if the branches have diverged.
             if branch_name in repo.branch_names:
                 if repo.branch_status(branch_name=branch_name) is not Status.UP_TO_DATE:
-                    repo.pull_branch(branch_name, with_fetch=True)
+                    repo.pull_branch(branch_name, with_fetch=False)
                 delete_branch_upon_completion = False
             else:
-                repo.new_branch(branch_name)
+                repo.new_branch(branch_name, with_fetch=False)
                 delete_branch_upon_completion = True
 
             # Merge the updates available from the official EasyBuild repo into
@@ -201,7 +319,7 @@ def update_from_easybuild_upstream(sb_config: StackBuilderConfig) -> None:
                 repo.push_branch(branch_name, allow_force=False)
             finally:
                 if delete_branch_upon_completion:
-                    _ = repo.git.branch("-d", branch_name)
+                    repo.delete_branch(branch_name)
 
         elif status in (Status.DIVERGED, status is Status.AHEAD):
             (url_sib_repo,) = repo.default_remote.urls
@@ -212,6 +330,8 @@ def update_from_easybuild_upstream(sb_config: StackBuilderConfig) -> None:
                 "Please resolve this issue manually."
             )
 
+    return True
+
 
 def update_repos(from_upstream: bool = False) -> None:
     """Main workflow of the 'update' command."""
@@ -220,16 +340,27 @@ def update_repos(from_upstream: bool = False) -> None:
     sb_config = load_config()
 
     # Get updates from the official EasyBuild upstream repo.
+    fetched_from_upstream = False
     if from_upstream:
         print(
             f"### Updating repo {sb_config.sib_easyconfigs_repo.name} "
             f"from {EB_OFFICIAL_REPO}:"
         )
-        update_from_easybuild_upstream(sb_config=sb_config)
+        fetched_from_upstream = update_from_easybuild_upstream(sb_config=sb_config)
         print("### ")
 
+    # Fetch updates for the SIB Git repos. Updates for the sib-easyconfigs
+    # repo may already have been fetched from all its remotes when updating it
+    # from the EasyBuild upstream repo.
+    # Note: the fetches are made one after the other, since fetching may
+    # require the user to enter credentials (e.g. an SSH key passphrase).
+    repos = (sb_config.sib_easyconfigs_repo, sb_config.sib_software_stack_repo)
+    for repo in repos:
+        if not (fetched_from_upstream and repo is sb_config.sib_easyconfigs_repo):
+            repo.fetch_updates()
+
     # Update the SIB Git repos.
-    for repo in (sb_config.sib_easyconfigs_repo, sb_config.sib_software_stack_repo):
+    for repo in repos:
         print(f"### Updating repo {repo.name}:")
-        update_local_repo(repo=repo, sb_config=sb_config)
+        update_local_repo(repo=repo, sb_config=sb_config, with_fetch=False)
         print("### ")